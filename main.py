@@ -5,17 +5,34 @@ no reinitialization during runtime, stable threads, minor correctness fixes.
 """
 
 import argparse
+import heapq
 import json
 import math
+import os
 import random
+import selectors
 import socket
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
 from typing import List, Tuple, Optional, Dict
 
+import numpy as np
 import pygame  # FIXED
 
+try:
+    from numba import njit  # optional: JIT-compiled A* inner loop
+except ImportError:
+    njit = None
+
+try:
+    import orjson  # optional: C JSON encoder for snapshot frames
+except ImportError:
+    orjson = None
+
+import protocol
+
 # -------------------------------
 # Configuration / Gameplay Vars
 # -------------------------------
@@ -25,6 +42,9 @@ MAX_SPAWNERS_PER_PLAYER = 4
 
 # Tower defaults and types
 TOWER_RADIUS = 16
+ENEMY_RADIUS = 10
+# tower lookup buckets; cell >= tower radius + click slop (see upgrade)
+TOWER_CELL = 32
 TOWER_TYPES = {
     "basic": {"range": 140, "dmg": 12, "fire_rate": 0.8, "cost": 50, "upgrade_cost": 40},
     "sniper": {"range": 240, "dmg": 30, "fire_rate": 1.6, "cost": 90, "upgrade_cost": 80},
@@ -38,8 +58,19 @@ ENEMY_TYPES = {
     "armored": {"hp": 70, "speed": 45, "reward": 25, "color": (200, 200, 220)},
 }
 
+# Stable per-type ids / lookup tables for the SoA enemy store
+ETYPE_NAMES = ("basic", "fast", "armored")
+ETYPE_IDS = {name: i for i, name in enumerate(ETYPE_NAMES)}
+ETYPE_COLORS = tuple(ENEMY_TYPES[n]["color"] for n in ETYPE_NAMES)
+ETYPE_MAX_HP = tuple(ENEMY_TYPES[n]["hp"] for n in ETYPE_NAMES)
+REWARD_LUT = np.array([ENEMY_TYPES[n]["reward"] for n in ETYPE_NAMES], np.int32)
+MAX_HP_LUT = np.array(ETYPE_MAX_HP, np.float32)
+
 SPAWN_INTERVAL = 3.5
 
+# Broadcast a full snapshot every N ticks; deltas in between
+KEYFRAME_INTERVAL = 30
+
 # Pathfinding grid
 PATH_GRID_SIZE = 24
 OBSTACLE_COUNT = 12
@@ -48,6 +79,10 @@ OBSTACLE_COUNT = 12
 WIDTH, HEIGHT = 1000, 640
 BASE_POS = (WIDTH - 60, HEIGHT // 2)
 BASE_RADIUS = 36
+BASE_X, BASE_Y = BASE_POS
+BASE_R2 = BASE_RADIUS * BASE_RADIUS
+# towers/spawners may not be placed within BASE_RADIUS + 40 of the base
+PLACEMENT_EXCL_R2 = (BASE_RADIUS + 40) ** 2
 
 # Colors
 WHITE = (255, 255, 255)
@@ -70,37 +105,114 @@ PHASE_GAMEOVER = "GAMEOVER"
 def dist(a: Tuple[float, float], b: Tuple[float, float]) -> float:
     return math.hypot(a[0] - b[0], a[1] - b[1])
 
+def encode_json_frame(obj) -> bytes:
+    """Newline-terminated JSON frame bytes, via orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode()
+
 # -------------------------------
 # Entities
 # -------------------------------
-@dataclass
-class Enemy:
-    pos: pygame.math.Vector2
-    hp: float
-    speed: float
-    radius: int
-    etype: str
-    color: Tuple[int, int, int]
-    path: List[Tuple[int, int]] = None
-    path_index: int = 0
-
-    def update(self, dt: float, pathfinder):
-        if self.path and self.path_index < len(self.path):
-            target = pygame.math.Vector2(self.path[self.path_index])
-            dir_vec = (target - self.pos)
-            if dir_vec.length_squared() < 1.0:
-                self.path_index += 1
-            else:
-                dir_vec = dir_vec.normalize()
-                self.pos += dir_vec * self.speed * dt
-        else:
-            target = pygame.math.Vector2(BASE_POS)
-            direction = (target - self.pos)
-            if direction.length() > 0:
-                self.pos += direction.normalize() * self.speed * dt
+class EnemyArray:
+    """Structure-of-arrays enemy store.
+
+    Live enemies occupy slots [0, count); arrays grow geometrically.
+    Movement is stepped for all enemies at once with vectorized NumPy
+    expressions instead of a Python loop over Enemy objects. Enemies
+    carry no path state: they all read the pathfinder's shared flow
+    field toward the base.
+    """
+
+    _FIELDS = ("px", "py", "speed", "hp", "etype_id")
+
+    def __init__(self, capacity: int = 256):
+        self.count = 0
+        self.capacity = capacity
+        self.px = np.zeros(capacity, np.float32)
+        self.py = np.zeros(capacity, np.float32)
+        self.speed = np.zeros(capacity, np.float32)
+        self.hp = np.zeros(capacity, np.float32)
+        self.etype_id = np.zeros(capacity, np.uint8)
+
+    def _grow(self):
+        new_cap = self.capacity * 2
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            grown = np.zeros(new_cap, arr.dtype)
+            grown[:self.capacity] = arr
+            setattr(self, name, grown)
+        self.capacity = new_cap
+
+    def spawn(self, x: float, y: float, etype: str):
+        if self.count >= self.capacity:
+            self._grow()
+        i = self.count
+        spec = ENEMY_TYPES[etype]
+        self.px[i] = x
+        self.py[i] = y
+        self.speed[i] = spec["speed"]
+        self.hp[i] = spec["hp"]
+        self.etype_id[i] = ETYPE_IDS[etype]
+        self.count += 1
+
+    def step(self, dt: float, pathfinder: "Pathfinder"):
+        n = self.count
+        if n == 0:
+            return
+        px = self.px[:n]
+        py = self.py[:n]
+        gs = pathfinder.grid_size
+        cx = np.clip(px.astype(np.int32) // gs, 0, pathfinder.cols - 1)
+        cy = np.clip(py.astype(np.int32) // gs, 0, pathfinder.rows - 1)
+        vx = pathfinder.flow_x[cx, cy]
+        vy = pathfinder.flow_y[cx, cy]
+        # zero flow = goal cell or unreachable pocket: head straight
+        # for the base, matching the old no-path fallback
+        stuck = (vx == 0.0) & (vy == 0.0)
+        if stuck.any():
+            dx = BASE_X - px[stuck]
+            dy = BASE_Y - py[stuck]
+            # epsilon floor guards the zero-length case (enemy exactly
+            # on the base) without a separate length check
+            inv = 1.0 / np.sqrt(np.maximum(dx * dx + dy * dy, 1e-6))
+            vx[stuck] = dx * inv
+            vy[stuck] = dy * inv
+        adv = self.speed[:n] * np.float32(dt)
+        px += vx * adv
+        py += vy * adv
+
+    def remove(self, dead_mask: np.ndarray):
+        """Compact out enemies where dead_mask is True (mask over [0, count))."""
+        n = self.count
+        keep = ~dead_mask
+        kept = int(keep.sum())
+        if kept == n:
+            return
+        for name in self._FIELDS:
+            arr = getattr(self, name)
+            arr[:kept] = arr[:n][keep]
+        self.count = kept
 
-    def to_dict(self):
-        return {"x": float(self.pos.x), "y": float(self.pos.y), "hp": self.hp, "etype": self.etype}
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def to_dicts(self):
+        # bulk-convert each column once (C loop) instead of pulling
+        # numpy scalars out element by element in Python; positions are
+        # quantized to pixels and hp to a 0-255 fraction of max hp,
+        # which is all the clients render
+        n = self.count
+        tids = self.etype_id[:n]
+        xs = self.px[:n].astype(np.int32).tolist()
+        ys = self.py[:n].astype(np.int32).tolist()
+        hs = np.clip(self.hp[:n] * (255.0 / MAX_HP_LUT[tids]),
+                     0, 255).astype(np.uint8).tolist()
+        return [{"x": x, "y": y, "h": h, "t": t}
+                for x, y, h, t in zip(xs, ys, hs, tids.tolist())]
 
 @dataclass
 class Tower:
@@ -119,28 +231,15 @@ class Tower:
         self.range = spec["range"]
         self.dmg = spec["dmg"]
         self.fire_rate = spec["fire_rate"]
+        self.range_sq = self.range * self.range
 
     def upgrade(self):
         self.level += 1
         self.dmg *= 1.3
         self.range = int(self.range * 1.15)
+        self.range_sq = self.range * self.range
         self.fire_rate = max(0.1, self.fire_rate * 0.9)
 
-    def update(self, dt: float, enemies: List[Enemy]):
-        if self.cooldown > 0:
-            self.cooldown -= dt
-        if self.cooldown <= 0:
-            target = None
-            min_d = 1e9
-            for e in enemies:
-                d = dist(self.pos, (e.pos.x, e.pos.y))
-                if d <= self.range and d < min_d:
-                    target = e
-                    min_d = d
-            if target:
-                target.hp -= self.dmg
-                self.cooldown = self.fire_rate
-
     def to_dict(self):
         return {"x": int(self.pos[0]), "y": int(self.pos[1]),
                 "owner": self.owner, "ttype": self.ttype, "level": self.level}
@@ -153,7 +252,7 @@ class Spawner:
     spawn_interval: float = SPAWN_INTERVAL
     etype: str = "basic"
 
-    def update(self, dt: float, enemies: List[Enemy], pathfinder):
+    def update(self, dt: float, enemies: "EnemyArray"):
         self.spawn_timer -= dt
         if self.spawn_timer <= 0:
             roll = random.random()
@@ -163,16 +262,9 @@ class Spawner:
                 etype = "fast"
             else:
                 etype = "armored"
-            spec = ENEMY_TYPES[etype]
-            epos = pygame.math.Vector2(self.pos[0] + random.uniform(-6, 6),
-                                       self.pos[1] + random.uniform(-6, 6))
-            e = Enemy(pos=epos, hp=spec["hp"], speed=spec["speed"],
-                      radius=10, etype=etype, color=spec["color"])
-            path = pathfinder.find_path((int(epos.x), int(epos.y)), BASE_POS)
-            if path:
-                e.path = path
-                e.path_index = 0
-            enemies.append(e)
+            ex = self.pos[0] + random.uniform(-6, 6)
+            ey = self.pos[1] + random.uniform(-6, 6)
+            enemies.spawn(ex, ey, etype)
             self.spawn_timer = max(0.6, self.spawn_interval + random.uniform(-0.6, 0.6))
 
     def to_dict(self):
@@ -181,12 +273,123 @@ class Spawner:
 # -------------------------------
 # Pathfinding (A*)
 # -------------------------------
+# 8-connected neighbour offsets and step costs shared by A* variants
+_ASTAR_DX = np.array([-1, 1, 0, 0, -1, -1, 1, 1], np.int32)
+_ASTAR_DY = np.array([0, 0, -1, 1, -1, 1, -1, 1], np.int32)
+_ASTAR_COST = np.array([1.0, 1.0, 1.0, 1.0,
+                        1.4142135623730951, 1.4142135623730951,
+                        1.4142135623730951, 1.4142135623730951], np.float32)
+
+if njit is not None:
+    @njit(cache=True)
+    def _astar_grid(bits, cols, rows, sx, sy, gx, gy):
+        """A* over a bit-packed obstacle grid; node ids are x * rows + y.
+
+        bits holds the obstacle grid packed 8 cells per byte along y
+        (LSB first), so the blocked test is a shift and mask with no
+        row-list indirection. Uses flat preallocated score arrays and a
+        manual binary heap of int32 node ids keyed by float32 f-scores,
+        so node expansion runs without Python objects. Returns an
+        (L, 2) int32 array of cells from start to goal, or an empty
+        array when unreachable.
+        """
+        size = cols * rows
+        inf = np.float32(1e30)
+        gscore = np.full(size, inf, np.float32)
+        came = np.full(size, -1, np.int32)
+        closed = np.zeros(size, np.uint8)
+        # each node is pushed at most once per incoming edge
+        heap_f = np.empty(size * 8, np.float32)
+        heap_n = np.empty(size * 8, np.int32)
+
+        start = sx * rows + sy
+        goal = gx * rows + gy
+        gscore[start] = 0.0
+        heap_f[0] = abs(sx - gx) + abs(sy - gy)
+        heap_n[0] = start
+        hsize = 1
+
+        while hsize > 0:
+            node = heap_n[0]
+            hsize -= 1
+            heap_f[0] = heap_f[hsize]
+            heap_n[0] = heap_n[hsize]
+            i = 0
+            while True:  # sift down
+                l = 2 * i + 1
+                r = l + 1
+                m = i
+                if l < hsize and heap_f[l] < heap_f[m]:
+                    m = l
+                if r < hsize and heap_f[r] < heap_f[m]:
+                    m = r
+                if m == i:
+                    break
+                heap_f[i], heap_f[m] = heap_f[m], heap_f[i]
+                heap_n[i], heap_n[m] = heap_n[m], heap_n[i]
+                i = m
+
+            if closed[node]:
+                continue
+            closed[node] = 1
+
+            if node == goal:
+                length = 1
+                cur = node
+                while came[cur] >= 0:
+                    length += 1
+                    cur = came[cur]
+                path = np.empty((length, 2), np.int32)
+                cur = node
+                for k in range(length - 1, -1, -1):
+                    path[k, 0] = cur // rows
+                    path[k, 1] = cur % rows
+                    cur = came[cur]
+                return path
+
+            x = node // rows
+            y = node % rows
+            g = gscore[node]
+            for k in range(8):
+                nx = x + _ASTAR_DX[k]
+                ny = y + _ASTAR_DY[k]
+                if nx < 0 or nx >= cols or ny < 0 or ny >= rows:
+                    continue
+                if (bits[nx, ny >> 3] >> (ny & 7)) & 1:
+                    continue
+                nb = nx * rows + ny
+                tentative = g + _ASTAR_COST[k]
+                if tentative < gscore[nb]:
+                    gscore[nb] = tentative
+                    came[nb] = node
+                    f = tentative + abs(nx - gx) + abs(ny - gy)
+                    j = hsize  # sift up
+                    heap_f[j] = f
+                    heap_n[j] = nb
+                    hsize += 1
+                    while j > 0:
+                        p = (j - 1) // 2
+                        if heap_f[p] <= heap_f[j]:
+                            break
+                        heap_f[p], heap_f[j] = heap_f[j], heap_f[p]
+                        heap_n[p], heap_n[j] = heap_n[j], heap_n[p]
+                        j = p
+        return np.empty((0, 2), np.int32)
+else:
+    _astar_grid = None
+
+
 class Pathfinder:
     def __init__(self, width: int, height: int, grid_size: int = PATH_GRID_SIZE):
         self.grid_size = grid_size
         self.cols = math.ceil(width / grid_size)
         self.rows = math.ceil(height / grid_size)
-        self.grid = [[0 for _ in range(self.rows)] for __ in range(self.cols)]
+        self.grid = np.zeros((self.cols, self.rows), np.uint8)
+        # obstacle grid packed 8 cells/byte along y for the jitted A*
+        self.obstacle_bits = np.packbits(self.grid, axis=1, bitorder="little")
+        # per-cell unit step toward the flow-field goal; zero until built
+        self.flow_x = np.zeros((self.cols, self.rows), np.float32)
+        self.flow_y = np.zeros((self.cols, self.rows), np.float32)
 
     def world_to_cell(self, pos):
         x, y = pos
@@ -203,14 +406,15 @@ class Pathfinder:
         right = min(self.cols - 1, rect.right // self.grid_size)
         top = max(0, rect.top // self.grid_size)
         bottom = min(self.rows - 1, rect.bottom // self.grid_size)
-        for cx in range(left, right + 1):
-            for cy in range(top, bottom + 1):
-                self.grid[cx][cy] = 1
+        self.grid[left:right + 1, top:bottom + 1] = 1
+        self._repack()
 
     def clear(self):
-        for x in range(self.cols):
-            for y in range(self.rows):
-                self.grid[x][y] = 0
+        self.grid.fill(0)
+        self._repack()
+
+    def _repack(self):
+        self.obstacle_bits = np.packbits(self.grid, axis=1, bitorder="little")
 
     def neighbors(self, node):
         x, y = node
@@ -223,17 +427,55 @@ class Pathfinder:
     def heuristic(self, a, b):
         return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+    def build_flow_field(self, goal_world):
+        """Single reverse BFS from the goal; every walkable cell gets a
+        unit step vector toward its BFS parent. All enemies share one
+        goal (the base), so this replaces per-enemy A* entirely."""
+        self.flow_x.fill(0.0)
+        self.flow_y.fill(0.0)
+        gx, gy = self.world_to_cell(goal_world)
+        cols, rows = self.cols, self.rows
+        visited = np.zeros((cols, rows), np.bool_)
+        visited[gx, gy] = True
+        inv_sqrt2 = 0.7071067811865476
+        q = deque()
+        q.append((gx, gy))
+        while q:
+            x, y = q.popleft()
+            for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1),
+                           (-1, -1), (-1, 1), (1, -1), (1, 1)):
+                nx, ny = x + dx, y + dy
+                if (0 <= nx < cols and 0 <= ny < rows
+                        and not visited[nx, ny] and self.grid[nx][ny] == 0):
+                    visited[nx, ny] = True
+                    k = inv_sqrt2 if dx and dy else 1.0
+                    self.flow_x[nx, ny] = -dx * k
+                    self.flow_y[nx, ny] = -dy * k
+                    q.append((nx, ny))
+
     def find_path(self, start_world, goal_world):
-        import heapq
         start = self.world_to_cell(start_world)
         goal = self.world_to_cell(goal_world)
-
+        if _astar_grid is not None:
+            cells = _astar_grid(self.obstacle_bits, self.cols, self.rows,
+                                start[0], start[1], goal[0], goal[1])
+            if cells.shape[0] == 0:
+                return None
+            return [self.cell_to_world_center((int(cx), int(cy)))
+                    for cx, cy in cells]
+        return self._find_path_py(start, goal)
+
+    def _find_path_py(self, start, goal):
+        """Pure-Python A*, used when numba is not installed."""
+        # bind heap ops as locals: cheaper dispatch in the hot loop
+        heappush = heapq.heappush
+        heappop = heapq.heappop
         open_heap = [(self.heuristic(start, goal), start)]
         came_from = {}
         gscore = {start: 0}
 
         while open_heap:
-            _, current = heapq.heappop(open_heap)
+            _, current = heappop(open_heap)
             if current == goal:
                 path = []
                 cur = current
@@ -248,58 +490,244 @@ class Pathfinder:
                 if tentative < gscore.get(nb, 1e9):
                     came_from[nb] = current
                     gscore[nb] = tentative
-                    heapq.heappush(open_heap, (tentative + self.heuristic(nb, goal), nb))
+                    heappush(open_heap, (tentative + self.heuristic(nb, goal), nb))
         return None
 
 # -------------------------------
 # Networking
 # -------------------------------
-class ClientHandler(threading.Thread):
-    def __init__(self, conn, addr, server):
-        super().__init__(daemon=True)
-        self.conn = conn
+class ClientState:
+    """Per-connection state for the single-threaded network loop."""
+    __slots__ = ("sock", "addr", "inbuf", "outq", "events", "subscribed")
+
+    def __init__(self, sock, addr):
+        self.sock = sock
         self.addr = addr
-        self.server = server
+        self.inbuf = b""
+        self.outq = deque()  # memoryviews of pending outgoing bytes
+        self.events = selectors.EVENT_READ
         self.subscribed = False
+
+
+class NetworkServer(threading.Thread):
+    """Single-threaded network I/O: one selector handles the listening
+    socket, all client reads and all client writes.
+
+    Replaces the old thread-per-client handlers (each burning a 500ms
+    recv timeout) and the separate broadcast writer thread. Other
+    threads hand bytes over with push() + wake(); the loop toggles
+    write interest per client as queues fill and drain.
+    """
+
+    def __init__(self, host, port, server):
+        super().__init__(daemon=True)
+        self.host = host
+        self.port = port
+        self.server = server
         self.running = True
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # local clients can skip the TCP/IP stack entirely via a Unix
+        # domain socket at a well-known per-port path
+        self.uds_path = f"/tmp/td-{port}.sock"
+        self.uds_sock = None
+        self.selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self.clients = {}  # sock -> ClientState
+        self.lock = threading.Lock()
+        self._want_write = set()
+
+    # -- cross-thread interface ------------------------------------
+    def push(self, sock, data):
+        """Queue bytes for a client; call wake() once after a batch."""
+        with self.lock:
+            st = self.clients.get(sock)
+            if st is None:
+                return
+            st.outq.append(memoryview(data))
+            self._want_write.add(sock)
+
+    def wake(self):
+        try:
+            self._wake_w.send(b"x")
+        except OSError:
+            pass
 
+    def stop(self):
+        self.running = False
+        self.wake()
+
+    # -- event loop -------------------------------------------------
     def run(self):
         try:
-            self.conn.settimeout(0.5)
-            buf = b""
-            while self.running and self.server.running:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.sock.bind((self.host, self.port))
+            self.sock.listen(8)
+            self.sock.setblocking(False)
+            self.selector.register(self.sock, selectors.EVENT_READ)
+            self.selector.register(self._wake_r, selectors.EVENT_READ)
+            print(f"[NET] Listening on {self.host}:{self.port}")
+            if hasattr(socket, "AF_UNIX"):
                 try:
-                    data = self.conn.recv(4096)
-                except socket.timeout:
-                    continue
-                except:
-                    break
-                if not data:
-                    break
-                buf += data
-                while b"\n" in buf:
-                    line, buf = buf.split(b"\n", 1)
-                    try:
-                        text = line.decode().strip()
-                    except:
-                        continue
-                    if text:
-                        self.process_line(text)
+                    if os.path.exists(self.uds_path):
+                        os.unlink(self.uds_path)
+                    self.uds_sock = socket.socket(socket.AF_UNIX,
+                                                  socket.SOCK_STREAM)
+                    self.uds_sock.bind(self.uds_path)
+                    self.uds_sock.listen(8)
+                    self.uds_sock.setblocking(False)
+                    self.selector.register(self.uds_sock,
+                                           selectors.EVENT_READ)
+                    print(f"[NET] Listening on {self.uds_path}")
+                except OSError as e:
+                    print(f"[NET] UDS listen failed ({e}), TCP only")
+                    self.uds_sock = None
+
+            while self.running:
+                with self.lock:
+                    want = self._want_write
+                    self._want_write = set()
+                for s in want:
+                    st = self.clients.get(s)
+                    if st is not None:
+                        self._set_write_interest(st, True)
+                for key, mask in self.selector.select(timeout=0.5):
+                    if key.fileobj is self.sock or key.fileobj is self.uds_sock:
+                        self._accept(key.fileobj)
+                    elif key.fileobj is self._wake_r:
+                        try:
+                            self._wake_r.recv(4096)
+                        except OSError:
+                            pass
+                    else:
+                        st = key.data
+                        if mask & selectors.EVENT_READ:
+                            self._read(st)
+                        if mask & selectors.EVENT_WRITE and st.sock in self.clients:
+                            self._write(st)
         finally:
-            self.close()
+            for st in list(self.clients.values()):
+                self._drop(st)
+            try: self.selector.close()
+            except: pass
+            for s in (self._wake_r, self._wake_w, self.sock, self.uds_sock):
+                if s is None:
+                    continue
+                try: s.close()
+                except: pass
+            try:
+                os.unlink(self.uds_path)
+            except OSError:
+                pass
+
+    def _set_write_interest(self, st, want):
+        events = st.events | selectors.EVENT_WRITE if want \
+            else st.events & ~selectors.EVENT_WRITE
+        if events == st.events:
+            return
+        st.events = events
+        try:
+            self.selector.modify(st.sock, events, st)
+        except (ValueError, KeyError, OSError):
+            pass
+
+    def _accept(self, listener):
+        try:
+            conn, addr = listener.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        st = ClientState(conn, addr or self.uds_path)
+        with self.lock:
+            self.clients[conn] = st
+        self.selector.register(conn, st.events, st)
+
+    def _read(self, st):
+        try:
+            data = st.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._drop(st)
+            return
+        if not data:
+            self._drop(st)
+            return
+        st.inbuf += data
+        while b"\n" in st.inbuf:
+            line, st.inbuf = st.inbuf.split(b"\n", 1)
+            try:
+                text = line.decode().strip()
+            except:
+                continue
+            if text:
+                self.process_line(st, text)
+
+    def _write(self, st):
+        q = st.outq
+        while q:
+            mv = q[0]
+            try:
+                n = st.sock.send(mv)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._drop(st)
+                return
+            if n < len(mv):
+                q[0] = mv[n:]
+                return
+            q.popleft()
+        self._set_write_interest(st, False)
+
+    def _drop(self, st):
+        with self.lock:
+            self.clients.pop(st.sock, None)
+        try:
+            self.selector.unregister(st.sock)
+        except (ValueError, KeyError):
+            pass
+        with self.server.lock:
+            if st.sock in self.server.subscribers:
+                self.server.subscribers.remove(st.sock)
+            self.server.needs_keyframe.discard(st.sock)
+            self.server.binary_subs.discard(st.sock)
+        try:
+            st.sock.close()
+        except OSError:
+            pass
 
-    def process_line(self, text):
+    # -- protocol ---------------------------------------------------
+    def reply(self, st, msg):
+        # binary subscribers get every byte length-prefix framed; raw
+        # text lines would desync their frame decoder
+        with self.server.lock:
+            binary = st.sock in self.server.binary_subs
+        if binary:
+            st.outq.append(memoryview(protocol.encode_text(msg.strip())))
+        else:
+            st.outq.append(memoryview(msg.encode()))
+        self._set_write_interest(st, True)
+
+    def process_line(self, st, text):
         parts = text.split()
         if not parts:
             return
         cmd = parts[0].upper()
         try:
             if cmd == "SUBSCRIBE":
+                binary = len(parts) >= 2 and parts[1].upper() == "BINARY"
                 with self.server.lock:
-                    if self.conn not in self.server.subscribers:
-                        self.subscribed = True
-                        self.server.subscribers.append(self.conn)
-                self.send("OK SUBSCRIBED\n")
+                    if st.sock not in self.server.subscribers:
+                        st.subscribed = True
+                        self.server.subscribers.append(st.sock)
+                    if binary:
+                        self.server.binary_subs.add(st.sock)
+                    else:
+                        # new JSON subscribers must get a keyframe
+                        # before deltas
+                        self.server.needs_keyframe.add(st.sock)
+                self.reply(st, "OK SUBSCRIBED\n")
 
             elif cmd == "BUY_TOWER" and len(parts) >= 5:
                 owner = int(parts[1])
@@ -328,62 +756,10 @@ class ClientHandler(threading.Thread):
                 self.server.enqueue({"type": "reset"})
 
             else:
-                self.send("ERR UNKNOWN_CMD\n")
+                self.reply(st, "ERR UNKNOWN_CMD\n")
 
         except Exception as e:
-            self.send(f"ERR {e}\n")
-
-    def send(self, msg):
-        try:
-            self.conn.sendall(msg.encode())
-        except:
-            self.close()
-
-    def close(self):
-        if self.conn:
-            with self.server.lock:
-                if self.conn in self.server.subscribers:
-                    self.server.subscribers.remove(self.conn)
-        try:
-            self.conn.close()
-        except:
-            pass
-        self.running = False
-
-class NetworkServer(threading.Thread):
-    def __init__(self, host, port, server):
-        super().__init__(daemon=True)
-        self.host = host
-        self.port = port
-        self.server = server
-        self.running = True
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
-    def run(self):
-        try:
-            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.sock.bind((self.host, self.port))
-            self.sock.listen(8)
-            self.sock.settimeout(1.0)
-            print(f"[NET] Listening on {self.host}:{self.port}")
-
-            while self.running:
-                try:
-                    conn, addr = self.sock.accept()
-                except socket.timeout:
-                    continue
-                handler = ClientHandler(conn, addr, self.server)
-                handler.start()
-                with self.server.lock:
-                    self.server.client_threads.append(handler)
-        finally:
-            try: self.sock.close()
-            except: pass
-
-    def stop(self):
-        self.running = False
-        try: self.sock.close()
-        except: pass
+            self.reply(st, f"ERR {e}\n")
 
 # -------------------------------
 # Game Server
@@ -396,6 +772,9 @@ class GameServer:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("consolas", 16)
         self.bigfont = pygame.font.SysFont("consolas", 32)
+        # rendered-text cache: font rendering is slow and HUD strings
+        # (and per-tower "L{n}" labels) repeat across frames
+        self._text_cache: Dict[Tuple[str, Tuple[int, int, int]], pygame.Surface] = {}
 
         # game state
         self.round_time_default = round_time
@@ -403,10 +782,11 @@ class GameServer:
 
         # network
         self.subscribers = []
-        self.client_threads = []
+        self.needs_keyframe = set()
+        self.binary_subs = set()
         self.net_thread = None
         self.lock = threading.Lock()
-        self.cmd_queue = []
+        self.cmd_queue = deque()
         self.running = True
 
     # ----------------------------------------------
@@ -415,8 +795,9 @@ class GameServer:
     def reset_state(self):
         self.phase = PHASE_SETUP
         self.towers = []
+        self.tower_grid: Dict[Tuple[int, int], List[Tower]] = {}
         self.spawners = []
-        self.enemies = []
+        self.enemies = EnemyArray()
         self.time_left = self.round_time_default
 
         self.placement_mode = 0
@@ -435,11 +816,13 @@ class GameServer:
             self.cmd_queue.append(cmd)
 
     def process_commands(self):
+        # swap-and-clear: O(1) handoff, no copying under the lock
         with self.lock:
-            cmds = self.cmd_queue[:]
-            self.cmd_queue = []
+            cmds = self.cmd_queue
+            self.cmd_queue = deque()
 
-        for cmd in cmds:
+        while cmds:
+            cmd = cmds.popleft()
             t = cmd["type"]
             if t == "buy_tower":
                 self._attempt_buy_tower(cmd["owner"], cmd["pos"], cmd["ttype"])
@@ -476,10 +859,12 @@ class GameServer:
                 continue
             self.obstacles.append(r)
             self.pathfinder.set_obstacle_rect(r)
+        # obstacles are final for this round: build the shared field now
+        self.pathfinder.build_flow_field(BASE_POS)
 
     def _attempt_buy_tower(self, owner, pos, ttype):
         mx, my = pos
-        if dist((mx,my), BASE_POS) < BASE_RADIUS + 40:
+        if (mx-BASE_X)**2 + (my-BASE_Y)**2 < PLACEMENT_EXCL_R2:
             return
         if self.tower_counts[owner] >= MAX_TOWERS_PER_PLAYER:
             return
@@ -492,14 +877,17 @@ class GameServer:
             if dist(t.pos, (mx,my)) < TOWER_RADIUS*2:
                 return
 
-        self.towers.append(Tower(pos=pos, owner=owner, ttype=ttype))
+        tower = Tower(pos=pos, owner=owner, ttype=ttype)
+        self.towers.append(tower)
+        cell = (mx // TOWER_CELL, my // TOWER_CELL)
+        self.tower_grid.setdefault(cell, []).append(tower)
         self.tower_counts[owner] += 1
         self.money[owner] -= cost
         print(f"[HOST] BUY_TOWER owner={owner} pos={pos} type={ttype}")
 
     def _attempt_place_spawner(self, owner, pos):
         mx, my = pos
-        if dist((mx,my), BASE_POS) < BASE_RADIUS + 40:
+        if (mx-BASE_X)**2 + (my-BASE_Y)**2 < PLACEMENT_EXCL_R2:
             return
         if self.spawner_counts[owner] >= MAX_SPAWNERS_PER_PLAYER:
             return
@@ -513,13 +901,19 @@ class GameServer:
 
     def _attempt_upgrade_tower_at(self, pos):
         mx, my = pos
+        cx = int(mx) // TOWER_CELL
+        cy = int(my) // TOWER_CELL
         nearest = None
         nd = 1e9
-        for t in self.towers:
-            d = dist(t.pos, (mx,my))
-            if d < nd and d <= t.radius + 16:
-                nearest = t
-                nd = d
+        # a tower within radius+16 of the click can only live in the
+        # click cell or one of its 8 neighbours
+        for nx in range(cx - 1, cx + 2):
+            for ny in range(cy - 1, cy + 2):
+                for t in self.tower_grid.get((nx, ny), ()):
+                    d = dist(t.pos, (mx,my))
+                    if d < nd and d <= t.radius + 16:
+                        nearest = t
+                        nd = d
 
         if not nearest:
             return
@@ -553,23 +947,28 @@ class GameServer:
         self.process_commands()
 
         if self.phase == PHASE_RUNNING:
-            for s in self.spawners: s.update(dt, self.enemies, self.pathfinder)
-            for e in self.enemies: e.update(dt, self.pathfinder)
-
-            survivors = []
-            for e in self.enemies:
-                if e.hp <= 0:
-                    reward = ENEMY_TYPES[e.etype]["reward"]
-                    self.money[1] += reward//2
-                    self.money[2] += reward - reward//2
-                else:
-                    survivors.append(e)
-            self.enemies = survivors
-
-            for t in self.towers: t.update(dt, self.enemies)
-
-            for e in self.enemies:
-                if dist((e.pos.x,e.pos.y), BASE_POS) <= BASE_RADIUS:
+            enemies = self.enemies
+            for s in self.spawners: s.update(dt, enemies)
+            enemies.step(dt, self.pathfinder)
+
+            n = enemies.count
+            if n:
+                dead = enemies.hp[:n] <= 0
+                if dead.any():
+                    # one gather + sum instead of a per-kill Python loop;
+                    # the pot is split once rather than per enemy
+                    total = int(REWARD_LUT[enemies.etype_id[:n][dead]].sum())
+                    self.money[1] += total // 2
+                    self.money[2] += total - total // 2
+                    enemies.remove(dead)
+
+            self.update_towers(dt)
+
+            n = enemies.count
+            if n:
+                dx = enemies.px[:n] - BASE_X
+                dy = enemies.py[:n] - BASE_Y
+                if ((dx * dx + dy * dy) <= BASE_R2).any():
                     self.phase = PHASE_GAMEOVER
                     self.winner = "ENEMIES"
                     print("[HOST] ENEMIES WIN (infiltration)")
@@ -584,6 +983,33 @@ class GameServer:
         elif self.phase == PHASE_GAMEOVER:
             self.gameover_timer += dt
 
+    def update_towers(self, dt):
+        """Closest-enemy-in-range for all towers in one broadcasted pass."""
+        towers = self.towers
+        for t in towers:
+            if t.cooldown > 0:
+                t.cooldown -= dt
+        n = self.enemies.count
+        if not towers or n == 0:
+            return
+        m = len(towers)
+        tx = np.fromiter((t.pos[0] for t in towers), np.float32, m)
+        ty = np.fromiter((t.pos[1] for t in towers), np.float32, m)
+        range_sq = np.fromiter((t.range_sq for t in towers), np.float32, m)
+        ex = self.enemies.px[:n]
+        ey = self.enemies.py[:n]
+        d2 = (tx[:, None] - ex[None, :]) ** 2 + (ty[:, None] - ey[None, :]) ** 2
+        d2[d2 > range_sq[:, None]] = np.inf
+        target = d2.argmin(axis=1)
+        in_range = d2[np.arange(m), target] != np.inf
+        ready = np.fromiter((t.cooldown <= 0 for t in towers), bool, m)
+        fire = in_range & ready
+        if fire.any():
+            dmg = np.fromiter((t.dmg for t in towers), np.float32, m)
+            np.add.at(self.enemies.hp, target[fire], -dmg[fire])
+            for i in np.nonzero(fire)[0]:
+                towers[i].cooldown = towers[i].fire_rate
+
     # ----------------------------------------------
     # Snapshot for subscribers
     # ----------------------------------------------
@@ -594,7 +1020,7 @@ class GameServer:
                 "time_left": float(self.time_left),
                 "towers": [t.to_dict() for t in self.towers],
                 "spawners": [s.to_dict() for s in self.spawners],
-                "enemies": [e.to_dict() for e in self.enemies],
+                "enemies": self.enemies.to_dicts(),
                 "money": {"1": self.money[1], "2": self.money[2]},
                 # FIXED rect fields
                 "obstacles": [
@@ -606,19 +1032,37 @@ class GameServer:
 
     def broadcast_loop(self, hz=10):
         interval = 1.0 / hz
+        tick = 0
+        last = None
         while self.running:
             snap = self.build_snapshot()
-            data = (json.dumps(snap) + "\n").encode()
+            keyframe = last is None or tick % KEYFRAME_INTERVAL == 0
+            full_data = encode_json_frame({"full": snap})
+            if keyframe:
+                delta_data = full_data
+            else:
+                # only ship top-level sections that actually changed;
+                # obstacles/towers/spawners are static most ticks
+                delta = {k: v for k, v in snap.items() if v != last[k]}
+                delta_data = encode_json_frame({"delta": delta})
+            last = snap
+            tick += 1
+
             with self.lock:
                 subs = list(self.subscribers)
+                binary = set(self.binary_subs)
+                fresh = self.needs_keyframe
+                self.needs_keyframe = set()
+            bin_data = protocol.encode_snapshot(snap) if binary else None
             for s in subs:
-                try: s.sendall(data)
-                except:
-                    with self.lock:
-                        if s in self.subscribers:
-                            self.subscribers.remove(s)
-                    try: s.close()
-                    except: pass
+                if s in binary:
+                    # binary frames are self-contained keyframes
+                    data = bin_data
+                else:
+                    data = full_data if (keyframe or s in fresh) else delta_data
+                self.net_thread.push(s, data)
+            if subs:
+                self.net_thread.wake()
             time.sleep(interval)
 
     # ----------------------------------------------
@@ -679,18 +1123,22 @@ class GameServer:
         finally:
             self.running = False
             if self.net_thread: self.net_thread.stop()
-            with self.lock:
-                for t in self.client_threads:
-                    try: t.close()
-                    except: pass
-                for s in self.subscribers:
-                    try: s.close()
-                    except: pass
             pygame.quit()
 
     # ----------------------------------------------
     # Rendering
     # ----------------------------------------------
+    def text(self, s, color=WHITE):
+        key = (s, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 256:
+                # money/timer strings churn; keep the cache bounded
+                self._text_cache.clear()
+            surf = self.font.render(s, True, color)
+            self._text_cache[key] = surf
+        return surf
+
     def draw(self):
         self.screen.fill((34,36,48))
         pygame.draw.line(self.screen,(60,60,80),(0,HEIGHT//2),BASE_POS,24)
@@ -700,7 +1148,7 @@ class GameServer:
 
         pygame.draw.circle(self.screen,(60,200,120),BASE_POS,BASE_RADIUS)
         pygame.draw.circle(self.screen,(30,160,80),BASE_POS,BASE_RADIUS-8)
-        text=self.font.render("BASE",True,BLACK)
+        text=self.text("BASE",BLACK)
         self.screen.blit(text,(BASE_POS[0]-text.get_width()//2, BASE_POS[1]-10))
 
         for s in self.spawners:
@@ -713,17 +1161,20 @@ class GameServer:
                                BLUE if t.owner==1 else PURPLE,
                                (int(t.pos[0]),int(t.pos[1])),
                                t.radius)
-            lvl=self.font.render(f"L{t.level}",True,WHITE)
+            lvl=self.text(f"L{t.level}")
             self.screen.blit(lvl,(t.pos[0]-lvl.get_width()//2,
                                   t.pos[1]-lvl.get_height()//2))
 
-        for e in self.enemies:
-            pygame.draw.circle(self.screen,e.color,(int(e.pos.x),int(e.pos.y)),e.radius)
+        enemies=self.enemies
+        for i in range(enemies.count):
+            ex,ey=int(enemies.px[i]),int(enemies.py[i])
+            tid=enemies.etype_id[i]
+            pygame.draw.circle(self.screen,ETYPE_COLORS[tid],(ex,ey),ENEMY_RADIUS)
             w,h=22,4
-            x=int(e.pos.x - w/2)
-            y=int(e.pos.y - e.radius - 10)
+            x=ex - w//2
+            y=ey - ENEMY_RADIUS - 10
             pygame.draw.rect(self.screen,RED,(x,y,w,h))
-            hp_w=max(0,int((e.hp/ENEMY_TYPES[e.etype]["hp"])*w))
+            hp_w=max(0,int((enemies.hp[i]/ETYPE_MAX_HP[tid])*w))
             pygame.draw.rect(self.screen,GREEN,(x,y,hp_w,h))
 
         self.draw_hud()
@@ -735,22 +1186,21 @@ class GameServer:
             "Left-click place | U upgrade | Enter start/reset",
         ]
         for i,l in enumerate(lines):
-            r=self.font.render(l,True,WHITE if i==0 else GRAY)
+            r=self.text(l,WHITE if i==0 else GRAY)
             self.screen.blit(r,(8,8+i*18))
 
-        txt=self.font.render(
+        txt=self.text(
             f"Towers: P1={self.tower_counts[1]} P2={self.tower_counts[2]}   "
             f"Spawners: E1={self.spawner_counts[1]} E2={self.spawner_counts[2]}   "
-            f"Enemies={len(self.enemies)}",
-            True,WHITE)
+            f"Enemies={len(self.enemies)}")
         self.screen.blit(txt,(8,HEIGHT-60))
 
-        money=self.font.render(
+        money=self.text(
             f"P1 Money ${self.money[1]}    P2 Money ${self.money[2]}",
-            True,YELLOW)
+            YELLOW)
         self.screen.blit(money,(8,HEIGHT-36))
 
-        rt=self.font.render(f"Time: {format_time(self.time_left)}",True,GREEN)
+        rt=self.text(f"Time: {format_time(self.time_left)}",GREEN)
         self.screen.blit(rt,(WIDTH//2 - rt.get_width()//2,8))
 
 def format_time(seconds):
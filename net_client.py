@@ -7,6 +7,7 @@ Usage:
 
 Then type commands:
     SUBSCRIBE
+    SUBSCRIBE BINARY
     BUY_TOWER <owner> <x> <y> <type>
     PLACE_SPAWNER <owner> <x> <y>
     UPGRADE_TOWER <x> <y>
@@ -14,40 +15,118 @@ Then type commands:
     RESET
 
 This client sends text commands terminated with newline to the host.
+With --binary the client subscribes with SUBSCRIBE BINARY right after
+connecting and decodes struct-packed frames instead of printing raw
+JSON lines; the host then frames its OK/ERR replies too, so the stream
+never mixes untagged text with binary frames.
+
+stdin and the socket are multiplexed on one selectors loop (no sender
+thread, no blocking input()); all command lines buffered on stdin are
+coalesced into a single send.
 """
 import argparse
+import os
+import selectors
 import socket
-import threading
 import sys
 
-def sender_loop(sock):
-    try:
-        while True:
-            line = input("> ").strip()
-            if not line:
-                continue
-            try:
-                sock.sendall((line + "\n").encode("utf-8"))
-            except BrokenPipeError:
-                print("Disconnected from host.")
+import protocol
+
+
+class BinaryFrameDecoder:
+    """Accumulates socket bytes and prints decoded snapshot frames."""
+
+    def __init__(self):
+        self.buf = b""
+
+    def feed(self, data):
+        self.buf = buf = self.buf + data
+        while len(buf) >= protocol.FRAME_PREFIX_SIZE:
+            need = protocol.frame_length(buf[:protocol.FRAME_PREFIX_SIZE])
+            if len(buf) < protocol.FRAME_PREFIX_SIZE + need:
                 break
-    except KeyboardInterrupt:
-        pass
+            payload = buf[protocol.FRAME_PREFIX_SIZE:
+                          protocol.FRAME_PREFIX_SIZE + need]
+            buf = buf[protocol.FRAME_PREFIX_SIZE + need:]
+            if payload[:1] == bytes((protocol.TEXT_FRAME,)):
+                # framed OK/ERR reply
+                print("[HOST]", payload[1:].decode("utf-8", "replace"))
+                continue
+            snap = protocol.decode_snapshot(payload)
+            print(f"[HOST] {snap['phase']} t={snap['time_left']:.1f} "
+                  f"towers={len(snap['towers'])} "
+                  f"enemies={len(snap['enemies'])} "
+                  f"money={snap['money']}")
+        self.buf = buf
 
-def receiver_loop(sock):
+
+class TextPrinter:
+    def feed(self, data):
+        print("[HOST]", data.decode("utf-8", "replace").strip())
+
+
+def client_loop(sock, binary=False):
+    """Single-threaded event loop over stdin and the socket."""
+    receiver = BinaryFrameDecoder() if binary else TextPrinter()
+    stdin_fd = sys.stdin.fileno()
+    # O_NONBLOCK lives on the open file description, which a terminal
+    # stdin shares with the parent shell - restore it on exit
+    stdin_was_blocking = os.get_blocking(stdin_fd)
+    os.set_blocking(stdin_fd, False)
+    # the socket stays blocking: reads are already gated on select(),
+    # and sendall on a non-blocking socket could drop a command tail
+    # on a partial send
+
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    sel.register(stdin_fd, selectors.EVENT_READ)
+
+    stdin_buf = b""
     try:
         while True:
-            data = sock.recv(4096)
-            if not data:
-                break
-            print("[HOST]", data.decode("utf-8").strip())
-    except:
+            for key, _ in sel.select():
+                if key.fileobj is sock:
+                    try:
+                        data = sock.recv(65536)
+                    except (BlockingIOError, InterruptedError):
+                        continue
+                    if not data:
+                        print("Disconnected from host.")
+                        return
+                    receiver.feed(data)
+                else:
+                    data = os.read(stdin_fd, 65536)
+                    if not data:
+                        return  # stdin EOF
+                    stdin_buf += data
+                    if b"\n" not in stdin_buf:
+                        continue
+                    *lines, stdin_buf = stdin_buf.split(b"\n")
+                    # coalesce every buffered command into one send
+                    out = b"".join(l.strip() + b"\n"
+                                   for l in lines if l.strip())
+                    if out:
+                        try:
+                            sock.sendall(out)
+                        except (BrokenPipeError, ConnectionResetError):
+                            print("Disconnected from host.")
+                            return
+    except KeyboardInterrupt:
         pass
+    finally:
+        try:
+            os.set_blocking(stdin_fd, stdin_was_blocking)
+        except OSError:
+            pass
+        sel.close()
+
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--host", required=True, help="Host IP")
     parser.add_argument("--port", type=int, default=9999)
+    parser.add_argument("--binary", action="store_true",
+                        help="decode struct-packed frames (SUBSCRIBE BINARY)")
     args = parser.parse_args()
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -56,13 +135,22 @@ def main():
     except Exception as e:
         print("Could not connect to host:", e)
         sys.exit(1)
-    print("Connected. Type commands or SUBSCRIBE to receive state.")
-    t_recv = threading.Thread(target=receiver_loop, args=(sock,), daemon=True)
-    t_recv.start()
     try:
-        sender_loop(sock)
+        # small command frames should not wait on Nagle
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+    if args.binary:
+        # subscribe before anything else so every byte the host ever
+        # sends us (including this command's reply) arrives framed
+        sock.sendall(b"SUBSCRIBE BINARY\n")
+        print("Connected & subscribed (binary). Type commands.")
+    else:
+        print("Connected. Type commands or SUBSCRIBE to receive state.")
+    try:
+        client_loop(sock, binary=args.binary)
     finally:
         sock.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,12 +1,20 @@
 import argparse
+import collections
 import json
+import queue
 import socket
+import struct
 import threading
 import time
-import copy
+import numpy as np
 import pygame
 import sys
 
+try:
+    import orjson  # optional: C JSON parser for snapshot frames
+except ImportError:
+    orjson = None
+
 # Visuals synced with host
 WIDTH, HEIGHT = 1000, 640
 BASE_POS = (WIDTH - 60, HEIGHT // 2)
@@ -24,6 +32,80 @@ PURPLE = (170, 80, 200)
 
 TOWER_TYPES = ["basic", "sniper", "rapid"]
 
+# enemy colors indexed by wire type id (basic, fast, armored)
+ETYPE_COLORS = ((255, 120, 80), (255, 200, 60), (200, 200, 220))
+
+# spawner fill indexed by owner
+SPAWNER_COLORS = {1: ORANGE, 2: RED}
+
+_EMPTY_I32 = np.empty(0, np.int32)
+_EMPTY_ENEMIES = (_EMPTY_I32, _EMPTY_I32, _EMPTY_I32, _EMPTY_I32)
+
+# parsed snapshot records: attribute access beats dict[str] hashing in
+# the per-frame draw loops, and the int casts happen once per snapshot
+Tower = collections.namedtuple("Tower", "x y ttype owner level")
+Spawner = collections.namedtuple("Spawner", "x y owner")
+
+
+def _make_draw_enemies():
+    """Compile an enemy draw routine specialized to the current type
+    table: per-type colors, the hp-bar colors and all geometry offsets
+    are baked into the generated source as literals, so the hot loop
+    carries no module-level lookups (partial evaluation). Rebuild if
+    ETYPE_COLORS ever becomes dynamic."""
+    src = [
+        "def _draw_enemies(screen, draw_circle, draw_rect, xs, ys, hs, ts):",
+        "    exs = xs.tolist()",
+        "    eys = ys.tolist()",
+        "    bxs = (xs - 11).tolist()",
+        "    bys = (ys - 20).tolist()",
+        "    hpws = ((hs * 22) // 255).tolist()",
+        "    for ex, ey, t in zip(exs, eys, ts.tolist()):",
+    ]
+    for i, color in enumerate(ETYPE_COLORS[:-1]):
+        kw = "if" if i == 0 else "elif"
+        src.append(f"        {kw} t == {i}:")
+        src.append(f"            draw_circle(screen, {color!r}, (ex, ey), 10)")
+    src.append("        else:")
+    src.append(f"            draw_circle(screen, {ETYPE_COLORS[-1]!r},"
+               " (ex, ey), 10)")
+    src += [
+        "    for x, y in zip(bxs, bys):",
+        f"        draw_rect(screen, {RED!r}, (x, y, 22, 4))",
+        "    for x, y, w in zip(bxs, bys, hpws):",
+        f"        draw_rect(screen, {GREEN!r}, (x, y, w, 4))",
+    ]
+    ns = {}
+    exec(compile("\n".join(src), "<draw_enemies>", "exec"), {}, ns)
+    return ns["_draw_enemies"]
+
+
+_draw_enemies = _make_draw_enemies()
+
+
+def _enemies_to_arrays(enemies):
+    """AoS->SoA: convert the parsed enemy dicts to (x, y, h, t) int32
+    arrays once per snapshot so draw() can do its math vectorized
+    instead of walking dicts per enemy per frame."""
+    n = len(enemies)
+    return (np.fromiter((e["x"] for e in enemies), np.int32, count=n),
+            np.fromiter((e["y"] for e in enemies), np.int32, count=n),
+            np.fromiter((e.get("h", 0) for e in enemies), np.int32, count=n),
+            np.fromiter((e.get("t", 0) for e in enemies), np.int32, count=n))
+
+# Linux zero-copy send support; the constants predate their addition
+# to the socket module
+SO_ZEROCOPY = getattr(socket, "SO_ZEROCOPY", 60)
+MSG_ZEROCOPY = getattr(socket, "MSG_ZEROCOPY", 0x4000000)
+SO_EE_ORIGIN_ZEROCOPY = 5
+# struct sock_extended_err: ee_errno, ee_origin, ee_type, ee_code,
+# ee_pad, ee_info, ee_data - the last two carry the inclusive range of
+# completed zero-copy send ids
+_SOCK_EXTENDED_ERR = struct.Struct("=IBBBBII")
+# pinning pages + reaping completions only pays off for large payloads;
+# command frames stay on the plain sendall path
+ZEROCOPY_MIN_BYTES = 16384
+
 
 # --------------------------------------------------
 # Client class
@@ -32,33 +114,139 @@ class NetClientGUI:
     def __init__(self, host, port):
         pygame.init()
         pygame.display.set_caption("Tower Defense - Network Client")
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        # with vsync, display.flip blocks precisely on retrace instead
+        # of approximating the frame budget with SDL_Delay in tick()
+        try:
+            self.screen = pygame.display.set_mode(
+                (WIDTH, HEIGHT), pygame.SCALED, vsync=1)
+            self.vsync = True
+        except pygame.error:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            self.vsync = False
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("consolas", 16)
         self.bigfont = pygame.font.SysFont("consolas", 28)
+        # rendered-text cache: font rasterization is slow and the HUD
+        # strings repeat across frames (timer/money churn per second)
+        self._text_cache = {}
 
         self.host = host
         self.port = port
         self.sock = None
         self.running = True
+        # published snapshot. Invariant: a snapshot is immutable once
+        # bound here - the parser always builds a fresh dict and
+        # rebinds, which is atomic under the GIL, so readers need no
+        # lock
         self.state = {}
-        self.state_lock = threading.Lock()
+        # redraw gating: the frame loop only re-renders when a new
+        # snapshot was published or local UI state changed
+        self.state_gen = 0
+        self._drawn_gen = -1
+        self._ui_dirty = True
+        self._last_frame_hash = None
 
         # controls
         self.owner = 1
         self.selected_tower_type = "basic"
         self.mode = "buy_tower"  # or "place_spawner"
         self.subscribed = False
+        self.frames_dropped = 0  # stale snapshots skipped under lag
+        # receiver -> parser hand-off; small bound so the parser always
+        # works near the freshest frame instead of a growing backlog
+        self.frame_q = queue.Queue(maxsize=2)
+
+        # keydown dispatch: one dict lookup per event instead of
+        # walking an if-chain
+        self._keymap = {
+            pygame.K_ESCAPE: self._quit,
+            pygame.K_1: lambda: self._set_owner(1),
+            pygame.K_2: lambda: self._set_owner(2),
+            pygame.K_t: lambda: self._cycle_tower(1),
+            pygame.K_g: lambda: self._cycle_tower(-1),
+            pygame.K_u: self._upgrade_at_mouse,
+            pygame.K_RETURN: lambda: self.send_cmd("START"),
+            pygame.K_r: lambda: self.send_cmd("RESET"),
+            pygame.K_TAB: self._toggle_mode,
+        }
+
+    # --------------------------------------------------
+    # Input handlers
+    # --------------------------------------------------
+    def _quit(self):
+        self.running = False
+
+    def _set_owner(self, owner):
+        self.owner = owner
+        self._ui_dirty = True
+
+    def _cycle_tower(self, step):
+        idx = TOWER_TYPES.index(self.selected_tower_type)
+        self.selected_tower_type = TOWER_TYPES[(idx + step) % len(TOWER_TYPES)]
+        self._ui_dirty = True
+
+    def _upgrade_at_mouse(self):
+        mx, my = pygame.mouse.get_pos()
+        self.send_cmd(f"UPGRADE_TOWER {mx} {my}")
+
+    def _toggle_mode(self):
+        self.mode = "place_spawner" if self.mode == "buy_tower" else "buy_tower"
+        self._ui_dirty = True
 
     # --------------------------------------------------
     # Networking
     # --------------------------------------------------
+    def _connect(self):
+        # same-machine hosts are reachable over a Unix domain socket,
+        # which skips the loopback TCP/IP stack entirely
+        if self.host in ("127.0.0.1", "::1", "localhost") and \
+                hasattr(socket, "AF_UNIX"):
+            try:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(f"/tmp/td-{self.port}.sock")
+                print("[CLIENT] Connected over Unix socket")
+                return sock
+            except OSError:
+                pass  # host not listening on UDS; fall back to TCP
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            # room for a burst of snapshots; set before connect so the
+            # TCP window is scaled accordingly
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        except OSError:
+            pass
+        sock.connect((self.host, self.port))
+        for opt in ("TCP_NODELAY", "TCP_QUICKACK"):
+            # commands should not wait on Nagle, snapshots should not
+            # stall on delayed ACKs; QUICKACK is Linux-only
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP,
+                                getattr(socket, opt), 1)
+            except (AttributeError, OSError):
+                pass
+        return sock
+
     def connect_and_subscribe(self):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.zerocopy = False
+        # buffers of in-flight MSG_ZEROCOPY sends, keyed by the
+        # kernel's per-socket completion counter; a buffer must stay
+        # referenced until its completion is reaped or reused memory
+        # could be transmitted
+        self._zc_pending = {}
+        self._zc_next = 0
         try:
-            self.sock.connect((self.host, self.port))
+            self.sock = self._connect()
+            if sys.platform == "linux" and \
+                    self.sock.family == socket.AF_INET:
+                try:
+                    self.sock.setsockopt(socket.SOL_SOCKET, SO_ZEROCOPY, 1)
+                    self.zerocopy = True
+                except OSError:
+                    pass
             t = threading.Thread(target=self.receiver_loop, daemon=True)
             t.start()
+            p = threading.Thread(target=self.parser_loop, daemon=True)
+            p.start()
             self.send_cmd("SUBSCRIBE")
             self.subscribed = True
             print("[CLIENT] Connected & Subscribed")
@@ -70,40 +258,223 @@ class NetClientGUI:
         if not self.sock:
             return
         try:
-            self.sock.sendall((text.strip() + "\n").encode("utf-8"))
+            data = (text.strip() + "\n").encode("utf-8")
+            if self.zerocopy and len(data) >= ZEROCOPY_MIN_BYTES:
+                # large payloads skip the user->kernel copy; commands
+                # are far below the threshold and take sendall
+                self._send_zerocopy(data)
+            else:
+                self.sock.sendall(data)
         except Exception as e:
             print("[CLIENT] send error:", e)
             self.running = False
 
+    def _send_zerocopy(self, data):
+        """sendall semantics over MSG_ZEROCOPY: loop until every byte
+        is queued (each send can be partial) and pin the buffer in
+        _zc_pending until the kernel's completion for it is reaped."""
+        mv = memoryview(data)
+        total = len(mv)
+        sent = 0
+        while sent < total:
+            try:
+                n = self.sock.send(mv[sent:], MSG_ZEROCOPY)
+            except OSError:
+                # kernel refused (e.g. optmem limit): finish with a
+                # plain copying send
+                self.sock.sendall(mv[sent:])
+                break
+            # each MSG_ZEROCOPY send gets the next completion id
+            self._zc_pending[self._zc_next] = data
+            self._zc_next += 1
+            sent += n
+        self._reap_zerocopy()
+
+    def _reap_zerocopy(self):
+        """Release in-flight zero-copy buffers whose completion the
+        kernel has posted to the socket error queue."""
+        try:
+            while self._zc_pending:
+                _, ancdata, _, _ = self.sock.recvmsg(
+                    0, 512, socket.MSG_ERRQUEUE | socket.MSG_DONTWAIT)
+                if not ancdata:
+                    break
+                for _, _, cdata in ancdata:
+                    if len(cdata) < _SOCK_EXTENDED_ERR.size:
+                        continue
+                    (_err, origin, _t, _c, _p,
+                     lo, hi) = _SOCK_EXTENDED_ERR.unpack_from(cdata)
+                    if origin != SO_EE_ORIGIN_ZEROCOPY:
+                        continue
+                    for zid in range(lo, hi + 1):
+                        self._zc_pending.pop(zid, None)
+        except (BlockingIOError, OSError):
+            pass
+
+    def _shed_and_put(self, line):
+        """Queue a frame for the parser.
+
+        Shedding must not break the delta chain: a frame may only be
+        dropped when a full frame queued after it makes it redundant
+        (same rule as the in-buffer keyframe pruning). So a full frame
+        drains everything queued before it; a delta never drops
+        anything - if no trailing keyframe covers the backlog, this
+        blocks for the one parse it takes to free a slot."""
+        q = self.frame_q
+        if line is not None and line.startswith(b'{"full"'):
+            # a keyframe supersedes the entire queued backlog
+            while True:
+                try:
+                    q.get_nowait()
+                    self.frames_dropped += 1
+                except queue.Empty:
+                    break
+            q.put(line)  # we are the only producer; a slot is free
+            return
+        while True:
+            try:
+                q.put_nowait(line)
+                return
+            except queue.Full:
+                # only safe to shed the head if the newest queued
+                # frame is a keyframe superseding it
+                with q.mutex:
+                    covered = bool(q.queue) and \
+                        q.queue[-1] is not None and \
+                        q.queue[-1].startswith(b'{"full"')
+                if not covered:
+                    q.put(line)
+                    return
+                try:
+                    q.get_nowait()
+                    self.frames_dropped += 1
+                except queue.Empty:
+                    pass
+
     def receiver_loop(self):
         """
         The host guarantees single-line JSON frames ending with '\n'.
-        We keep framing simple but safe.
+        This thread only frames bytes into lines; parsing happens on
+        parser_loop so socket reads and JSON decoding overlap.
+
+        Receives go through recv_into straight into one preallocated
+        bytearray with a fill cursor, so at 60 snapshots/sec the
+        kernel->user copy lands in reused memory - no intermediate
+        bytes object per recv and no `buf += data` reallocation of the
+        whole backlog (O(N) total instead of O(N^2) when behind).
         """
-        buf = b""
+        rxbuf = bytearray(1 << 20)
+        rxlen = 0
         try:
             while self.running:
-                data = self.sock.recv(65536)
-                if not data:
+                if rxlen == len(rxbuf):
+                    # a single line larger than the buffer; double it
+                    rxbuf.extend(bytes(len(rxbuf)))
+                n = self.sock.recv_into(memoryview(rxbuf)[rxlen:])
+                if n == 0:
                     break
-                buf += data
-
-                while b"\n" in buf:
-                    line, buf = buf.split(b"\n", 1)
+                rxlen += n
+
+                end = rxbuf.rfind(b"\n", 0, rxlen)
+                if end < 0:
+                    continue
+                lines = bytes(rxbuf[:end]).split(b"\n")
+                # shift the partial trailing line to the front
+                rest = rxlen - (end + 1)
+                rxbuf[:rest] = rxbuf[end + 1:rxlen]
+                rxlen = rest
+                if len(lines) > 1:
+                    # several frames piled up (lag spike, GC pause);
+                    # anything before the newest keyframe cannot affect
+                    # the final displayed state, so skip parsing it.
+                    # Deltas after the keyframe must still be applied.
+                    for i in range(len(lines) - 1, 0, -1):
+                        if lines[i].startswith(b'{"full"'):
+                            self.frames_dropped += i
+                            lines = lines[i:]
+                            break
+                for line in lines:
                     line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        snap = json.loads(line.decode("utf-8"))
-                    except Exception:
-                        continue
-                    with self.state_lock:
-                        self.state = snap
+                    if line:
+                        self._shed_and_put(line)
         except:
             pass
         finally:
             print("[CLIENT] disconnected")
             self.running = False
+            self._shed_and_put(None)  # unblock the parser
+
+    def parser_loop(self):
+        """Decodes frames handed over by receiver_loop and publishes
+        the merged snapshot."""
+        # orjson parses bytes directly, skipping the utf-8 decode too
+        if orjson is not None:
+            loads = orjson.loads
+        else:
+            loads = lambda b: json.loads(b.decode("utf-8"))
+        q = self.frame_q
+        while True:
+            line = q.get()
+            if line is None:
+                break
+            # byte-identical repeat of the last frame (idle SETUP
+            # screen, paused game): nothing to parse or redraw
+            h = hash(line)
+            if h == self._last_frame_hash:
+                continue
+            self._last_frame_hash = h
+            try:
+                frame = loads(line)
+            except Exception:
+                continue
+            if "full" in frame:
+                snap = frame["full"]
+            elif "delta" in frame:
+                # deltas only carry the top-level sections that
+                # changed since the last frame
+                snap = dict(self.state)
+                snap.update(frame["delta"])
+            else:
+                snap = frame
+            enemies = snap.get("enemies")
+            if isinstance(enemies, list):
+                try:
+                    snap["enemies"] = _enemies_to_arrays(enemies)
+                except (KeyError, TypeError):
+                    snap["enemies"] = _EMPTY_ENEMIES
+            towers = snap.get("towers")
+            if isinstance(towers, list) and not (
+                    towers and isinstance(towers[0], Tower)):
+                try:
+                    snap["towers"] = [
+                        Tower(int(t["x"]), int(t["y"]),
+                              t.get("ttype", "basic"),
+                              t.get("owner", 1), t.get("level", 1))
+                        for t in towers]
+                except (KeyError, TypeError):
+                    snap["towers"] = []
+            spawners = snap.get("spawners")
+            if isinstance(spawners, list) and not (
+                    spawners and isinstance(spawners[0], Spawner)):
+                try:
+                    snap["spawners"] = [
+                        Spawner(int(s["x"]), int(s["y"]),
+                                s.get("owner", 1))
+                        for s in spawners]
+                except (KeyError, TypeError):
+                    snap["spawners"] = []
+            obstacles = snap.get("obstacles")
+            if isinstance(obstacles, list) and not (
+                    obstacles and isinstance(obstacles[0], pygame.Rect)):
+                try:
+                    snap["obstacles"] = [
+                        pygame.Rect(int(r["x"]), int(r["y"]),
+                                    int(r["w"]), int(r["h"]))
+                        for r in obstacles]
+                except (KeyError, TypeError):
+                    snap["obstacles"] = []
+            self.state = snap
+            self.state_gen += 1
 
     # --------------------------------------------------
     # Main loop
@@ -117,28 +488,11 @@ class NetClientGUI:
                     self.running = False
                     break
                 if ev.type == pygame.KEYDOWN:
-                    if ev.key == pygame.K_ESCAPE:
-                        self.running = False
+                    handler = self._keymap.get(ev.key)
+                    if handler:
+                        handler()
+                    if not self.running:
                         break
-                    if ev.key == pygame.K_1:
-                        self.owner = 1
-                    if ev.key == pygame.K_2:
-                        self.owner = 2
-                    if ev.key == pygame.K_t:
-                        idx = TOWER_TYPES.index(self.selected_tower_type)
-                        self.selected_tower_type = TOWER_TYPES[(idx + 1) % len(TOWER_TYPES)]
-                    if ev.key == pygame.K_g:
-                        idx = TOWER_TYPES.index(self.selected_tower_type)
-                        self.selected_tower_type = TOWER_TYPES[(idx - 1) % len(TOWER_TYPES)]
-                    if ev.key == pygame.K_u:
-                        mx, my = pygame.mouse.get_pos()
-                        self.send_cmd(f"UPGRADE_TOWER {mx} {my}")
-                    if ev.key == pygame.K_RETURN:
-                        self.send_cmd("START")
-                    if ev.key == pygame.K_r:
-                        self.send_cmd("RESET")
-                    if ev.key == pygame.K_TAB:
-                        self.mode = "place_spawner" if self.mode == "buy_tower" else "buy_tower"
 
                 if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
                     mx, my = ev.pos
@@ -149,9 +503,20 @@ class NetClientGUI:
                     else:
                         self.send_cmd(f"PLACE_SPAWNER {self.owner} {mx} {my}")
 
-            self.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            gen = self.state_gen
+            if gen != self._drawn_gen or self._ui_dirty:
+                self._drawn_gen = gen
+                self._ui_dirty = False
+                self.draw()
+                pygame.display.flip()
+                if self.vsync:
+                    self.clock.tick()  # flip already paced us to retrace
+                else:
+                    self.clock.tick_busy_loop(60)
+            else:
+                # nothing changed, nothing flipped; just keep polling
+                # events at frame rate
+                self.clock.tick(60)
 
         try:
             if self.sock:
@@ -168,72 +533,58 @@ class NetClientGUI:
 
         pygame.draw.line(self.screen, (60, 60, 80), (0, HEIGHT // 2), BASE_POS, 24)
 
-        with self.state_lock:
-            snap = copy.deepcopy(self.state)
+        # reference grab of the latest published snapshot; the rebind
+        # in parser_loop is atomic and snapshots are never mutated
+        snap = self.state
 
-        # obstacles
-        for ob in snap.get("obstacles", []):
-            try:
-                r = pygame.Rect(int(ob["x"]), int(ob["y"]), int(ob["w"]), int(ob["h"]))
-                pygame.draw.rect(self.screen, (90, 90, 100), r)
-            except:
-                continue
+        screen = self.screen
+        draw_rect = pygame.draw.rect
+        draw_circle = pygame.draw.circle
+
+        # obstacles (pygame.Rects, built once in the parser)
+        for r in snap.get("obstacles", []):
+            draw_rect(screen, (90, 90, 100), r)
 
         # base
-        pygame.draw.circle(self.screen, (60, 200, 120), BASE_POS, BASE_RADIUS)
-        pygame.draw.circle(self.screen, (30, 160, 80), BASE_POS, BASE_RADIUS - 8)
+        draw_circle(screen, (60, 200, 120), BASE_POS, BASE_RADIUS)
+        draw_circle(screen, (30, 160, 80), BASE_POS, BASE_RADIUS - 8)
 
         # spawners
         for s in snap.get("spawners", []):
-            try:
-                sx = int(s["x"])
-                sy = int(s["y"])
-                color = ORANGE if s["owner"] == 1 else RED
-                pygame.draw.rect(self.screen, color, (sx - 12, sy - 12, 24, 24))
-            except:
-                continue
+            draw_rect(screen, SPAWNER_COLORS.get(s.owner, RED),
+                      (s.x - 12, s.y - 12, 24, 24))
 
         # towers
         for t in snap.get("towers", []):
-            try:
-                tx, ty = int(t["x"]), int(t["y"])
-                color = BLUE if t["owner"] == 1 else PURPLE
-                pygame.draw.circle(self.screen, color, (tx, ty), 16)
-                lvl = self.font.render(f"L{t.get('level',1)}", True, WHITE)
-                self.screen.blit(lvl, (tx - lvl.get_width()//2, ty - lvl.get_height()//2))
-            except:
-                continue
-
-        # enemies
-        for e in snap.get("enemies", []):
-            try:
-                ex, ey = int(e["x"]), int(e["y"])
-                etype = e.get("etype", "basic")
-                color = (255, 120, 80)
-                if etype == "fast":
-                    color = (255, 200, 60)
-                elif etype == "armored":
-                    color = (200, 200, 220)
-                pygame.draw.circle(self.screen, color, (ex, ey), 10)
-
-                # hp bar
-                w = 22
-                h = 4
-                x = ex - w // 2
-                y = ey - 10 - 10
-                pygame.draw.rect(self.screen, RED, (x, y, w, h))
-                maxhp = 30
-                if etype == "fast":
-                    maxhp = 18
-                if etype == "armored":
-                    maxhp = 70
-                hpw = max(0, int((e.get("hp", 0) / maxhp) * w))
-                pygame.draw.rect(self.screen, GREEN, (x, y, hpw, h))
-            except:
-                continue
+            color = BLUE if t.owner == 1 else PURPLE
+            draw_circle(screen, color, (t.x, t.y), 16)
+            lvl = self._render(f"L{t.level}", WHITE)
+            screen.blit(lvl, (t.x - lvl.get_width()//2,
+                              t.y - lvl.get_height()//2))
+
+        # enemies arrive as (x, y, h, t) int32 arrays (converted from
+        # the wire dicts in the parser); the generated _draw_enemies
+        # does the vectorized geometry math and the pygame calls with
+        # all constants inlined
+        xs, ys, hs, ts = snap.get("enemies", _EMPTY_ENEMIES)
+        try:
+            _draw_enemies(screen, draw_circle, draw_rect, xs, ys, hs, ts)
+        except (AttributeError, IndexError, TypeError):
+            pass  # malformed frame
 
         self.draw_ui(snap)
 
+    def _render(self, text, color, big=False):
+        key = (text, color, big)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) > 128:
+                self._text_cache.clear()
+            font = self.bigfont if big else self.font
+            surf = font.render(text, True, color)
+            self._text_cache[key] = surf
+        return surf
+
     def draw_ui(self, snap):
         lines = [
             f"Mode: {'BUY TOWER' if self.mode=='buy_tower' else 'PLACE SPAWNER'} (TAB)",
@@ -243,26 +594,25 @@ class NetClientGUI:
         ]
         for i, l in enumerate(lines):
             col = WHITE if i == 0 else GRAY
-            r = self.font.render(l, True, col)
+            r = self._render(l, col)
             self.screen.blit(r, (8, 8 + i * 18))
 
-        money = snap.get("money", {"1": 0, "2": 0})
-        mtxt = self.font.render(
-            f"P1 Money: ${money.get('1',0)}   P2 Money: ${money.get('2',0)}",
-            True, YELLOW)
+        money = snap.get("money") or {}
+        p1 = money.get("1", 0)
+        p2 = money.get("2", 0)
+        mtxt = self._render("P1 Money: $%d   P2 Money: $%d" % (p1, p2),
+                            YELLOW)
         self.screen.blit(mtxt, (8, HEIGHT - 36))
 
-        rt = int(snap.get("time_left", 0))
-        rt_text = self.font.render(
-            f"Time Left: {rt//60:02d}:{rt%60:02d}",
-            True, GREEN)
+        mm, ss = divmod(int(snap.get("time_left", 0)), 60)
+        rt_text = self._render("Time Left: %02d:%02d" % (mm, ss), GREEN)
         self.screen.blit(rt_text, (WIDTH//2 - rt_text.get_width()//2, 8))
 
         winner = snap.get("winner", "")
         if winner:
             msg = "TOWERS WIN!" if winner == "TOWERS" else "ENEMIES WIN!"
             col = GREEN if winner == "TOWERS" else RED
-            h = self.bigfont.render(msg, True, col)
+            h = self._render(msg, col, big=True)
             self.screen.blit(h, (WIDTH//2 - h.get_width()//2, HEIGHT//2 - 20))
 
 
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Struct-packed binary snapshot framing for the tower defense host.
+
+Subscribers that send "SUBSCRIBE BINARY" receive length-prefixed
+little-endian frames instead of newline-terminated JSON. A frame is:
+
+    u32 payload length, then:
+    header  <BBfiiHHHHB : version, phase_id, time_left,
+                          money1, money2,
+                          n_towers, n_spawners, n_enemies, n_obstacles,
+                          winner_id
+    towers  <hhBBB      : x, y, ttype_id, owner, level
+    spawners <hhB       : x, y, owner
+    enemies <hhBB       : x, y, etype_id, hp scaled to 0-255 of max hp
+    obstacles <hhhh     : x, y, w, h
+
+OK/ERR replies to binary subscribers use the same length prefix with a
+payload starting with TEXT_FRAME (0xFF, never a valid version byte)
+followed by utf-8 text, so text and snapshots are never interleaved
+untagged on one stream.
+
+This module is deliberately free of pygame/numpy imports so thin
+clients can use decode_snapshot without pulling in the game stack.
+The type tables below must stay in sync with main.TOWER_TYPES /
+main.ENEMY_TYPES.
+"""
+import struct
+
+VERSION = 1
+TEXT_FRAME = 0xFF  # first payload byte of a framed text reply
+
+PHASES = ("SETUP", "RUNNING", "GAMEOVER")
+WINNERS = ("", "TOWERS", "ENEMIES")
+TTYPE_NAMES = ("basic", "sniper", "rapid")
+ETYPE_NAMES = ("basic", "fast", "armored")
+
+_PHASE_IDS = {name: i for i, name in enumerate(PHASES)}
+_WINNER_IDS = {name: i for i, name in enumerate(WINNERS)}
+_TTYPE_IDS = {name: i for i, name in enumerate(TTYPE_NAMES)}
+
+_LEN = struct.Struct("<I")
+_HEADER = struct.Struct("<BBfiiHHHHB")
+_TOWER = struct.Struct("<hhBBB")
+_SPAWNER = struct.Struct("<hhB")
+_ENEMY = struct.Struct("<hhBB")
+_OBSTACLE = struct.Struct("<hhhh")
+
+
+def encode_snapshot(snap: dict) -> bytes:
+    """Pack a build_snapshot()-shaped dict into one binary frame."""
+    towers = snap.get("towers", [])
+    spawners = snap.get("spawners", [])
+    enemies = snap.get("enemies", [])
+    obstacles = snap.get("obstacles", [])
+
+    parts = [
+        _HEADER.pack(
+            VERSION,
+            _PHASE_IDS.get(snap.get("phase", "SETUP"), 0),
+            float(snap.get("time_left", 0.0)),
+            int(snap.get("money", {}).get("1", 0)),
+            int(snap.get("money", {}).get("2", 0)),
+            len(towers), len(spawners), len(enemies), len(obstacles),
+            _WINNER_IDS.get(snap.get("winner", ""), 0),
+        )
+    ]
+    for t in towers:
+        parts.append(_TOWER.pack(int(t["x"]), int(t["y"]),
+                                 _TTYPE_IDS.get(t.get("ttype", "basic"), 0),
+                                 int(t.get("owner", 1)),
+                                 min(255, int(t.get("level", 1)))))
+    for s in spawners:
+        parts.append(_SPAWNER.pack(int(s["x"]), int(s["y"]),
+                                   int(s.get("owner", 1))))
+    for e in enemies:
+        parts.append(_ENEMY.pack(int(e["x"]), int(e["y"]),
+                                 int(e.get("t", 0)),
+                                 max(0, min(255, int(e.get("h", 0))))))
+    for r in obstacles:
+        parts.append(_OBSTACLE.pack(int(r["x"]), int(r["y"]),
+                                    int(r["w"]), int(r["h"])))
+
+    payload = b"".join(parts)
+    return _LEN.pack(len(payload)) + payload
+
+
+def encode_text(msg: str) -> bytes:
+    """Frame an OK/ERR reply for a binary subscriber."""
+    payload = bytes((TEXT_FRAME,)) + msg.encode("utf-8")
+    return _LEN.pack(len(payload)) + payload
+
+
+def decode_snapshot(payload: bytes) -> dict:
+    """Unpack one frame payload (length prefix already stripped) back
+    into the JSON snapshot shape. Enemies keep the quantized wire
+    record: pixel ints with type id "t" and 0-255 hp byte "h"."""
+    (version, phase_id, time_left, money1, money2,
+     n_towers, n_spawners, n_enemies, n_obstacles,
+     winner_id) = _HEADER.unpack_from(payload, 0)
+    if version != VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+
+    off = _HEADER.size
+    towers = []
+    for _ in range(n_towers):
+        x, y, tid, owner, level = _TOWER.unpack_from(payload, off)
+        off += _TOWER.size
+        towers.append({"x": x, "y": y, "ttype": TTYPE_NAMES[tid],
+                       "owner": owner, "level": level})
+    spawners = []
+    for _ in range(n_spawners):
+        x, y, owner = _SPAWNER.unpack_from(payload, off)
+        off += _SPAWNER.size
+        spawners.append({"x": x, "y": y, "owner": owner})
+    enemies = []
+    for _ in range(n_enemies):
+        x, y, eid, hp_b = _ENEMY.unpack_from(payload, off)
+        off += _ENEMY.size
+        enemies.append({"x": x, "y": y, "t": eid, "h": hp_b})
+    obstacles = []
+    for _ in range(n_obstacles):
+        x, y, w, h = _OBSTACLE.unpack_from(payload, off)
+        off += _OBSTACLE.size
+        obstacles.append({"x": x, "y": y, "w": w, "h": h})
+
+    return {"phase": PHASES[phase_id], "time_left": time_left,
+            "towers": towers, "spawners": spawners, "enemies": enemies,
+            "money": {"1": money1, "2": money2},
+            "obstacles": obstacles, "winner": WINNERS[winner_id]}
+
+
+def frame_length(prefix: bytes) -> int:
+    """Payload length encoded in a 4-byte frame prefix."""
+    return _LEN.unpack(prefix)[0]
+
+
+FRAME_PREFIX_SIZE = _LEN.size